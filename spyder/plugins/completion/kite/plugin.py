@@ -45,11 +45,9 @@ class KiteCompletionPlugin(SpyderCompletionPlugin):
         self.client = KiteClient(None)
         self.kite_process = None
 
-        # Installation dialog
+        # Installation dialog (created the first time it's needed)
         self.installation_thread = KiteInstallationThread(self)
-        self.installer = KiteInstallerDialog(
-            parent,
-            self.installation_thread)
+        self._installer = None
 
         # Status widget
         statusbar = parent.statusBar()  # MainWindow status bar
@@ -80,6 +78,15 @@ class KiteCompletionPlugin(SpyderCompletionPlugin):
         # Config
         self.update_configuration()
 
+    @property
+    def installer(self):
+        """Kite installation dialog."""
+        if self._installer is None:
+            self._installer = KiteInstallerDialog(
+                self.main,
+                self.installation_thread)
+        return self._installer
+
     @Slot(list)
     def http_client_ready(self, languages):
         logger.debug('Kite client is available for {0}'.format(languages))
@@ -10,8 +10,10 @@
 import sys
 
 # Third-party imports
-from qtpy.QtCore import QEvent, QObject, QSize, Qt, QUrl, Signal
-from qtpy.QtGui import QDesktopServices, QMovie, QPixmap
+from qtpy.QtCore import (QElapsedTimer, QEvent, QObject, QSize, Qt, QTimer,
+                         QUrl, Signal)
+from qtpy.QtGui import QDesktopServices, QMovie, QPainter, QPixmap
+from qtpy.QtSvg import QSvgRenderer
 from qtpy.QtWidgets import (QApplication, QDialog, QHBoxLayout, QMessageBox,
                             QLabel, QProgressBar, QPushButton, QVBoxLayout,
                             QWidget)
@@ -27,6 +29,95 @@ from spyder.plugins.completion.kite.utils.install import (ERRORED, INSTALLING,
 KITE_SPYDER_URL = "https://kite.com/integrations/spyder"
 KITE_CONTACT_URL = "https://kite.com/contact/"
 
+# Installer dialog window flags
+if sys.platform == 'darwin':
+    INSTALLER_WINDOW_FLAGS = (Qt.Dialog | Qt.MSWindowsFixedSizeDialogHint
+                              | Qt.Tool)
+else:
+    INSTALLER_WINDOW_FLAGS = Qt.Dialog | Qt.MSWindowsFixedSizeDialogHint
+
+# Translated texts, built once per session instead of once per dialog
+INTEGRATION_HTML = _(
+    "Now Spyder can use <a href=\"{kite_url}\">Kite</a> to "
+    "provide better and more accurate code completions in its "
+    "editor <br>for the most important packages in the Python "
+    "scientific ecosystem, such as Numpy, <br>Matplotlib and "
+    "Pandas.<br><br>Would you like to install it or learn more "
+    "about it?<br><br><i>Note:</i> Kite is free to use "
+    "but is not an open source program.").format(kite_url=KITE_SPYDER_URL)
+
+WELCOME_HTML = _(
+    "<big><b>Level up your completions with "
+    "Kite</b></big><br><br>"
+    "Kite is a native app that runs locally "
+    "on your computer <br>and uses machine learning "
+    "to provide advanced <br>completions.<br><br>"
+    "&#10003; Specialized support for Python "
+    "data analysis packages<br><br>"
+    "&#10003; 1.5x more completions "
+    "than the builtin engine<br><br>"
+    "&#10003; Completions ranked by code context <br><br>"
+    "&#10003; Full line code completions<br><br>"
+    "&#10003; 100% local - no internet "
+    "connection required<br><br>"
+    "&#10003; 100% free to use<br><br>"
+    "<a href=\"{kite_url}\">Learn more on the Kite website</a>").format(
+        kite_url=KITE_SPYDER_URL)
+
+INSTALL_INFO_HTML = _(
+    "Kite comes with a native app called the Copilot <br>"
+    "which provides you with real time <br>"
+    "documentation as you code.<br><br>"
+    "When Kite is done installing, the Copilot will <br>"
+    "launch automatically and guide you throught the <br>"
+    "rest of the setup process.")
+
+# Hover event types, looked up once since the filter runs on every event
+HOVER_ENTER = QEvent.HoverEnter
+HOVER_LEAVE = QEvent.HoverLeave
+
+# Minimum time between progress bar repaints (in ms), i.e. about one frame
+PROGRESS_UPDATE_INTERVAL = 16
+
+# Decoded pixmaps shared by all installer dialogs, keyed by image path
+_PIXMAP_CACHE = {}
+
+
+def get_cached_pixmap(image_path):
+    """Return the pixmap for image_path, loading it only the first time."""
+    pixmap = _PIXMAP_CACHE.get(image_path)
+    if pixmap is None:
+        pixmap = QPixmap(image_path)
+        _PIXMAP_CACHE[image_path] = pixmap
+    return QPixmap(pixmap)
+
+
+def get_cached_svg_pixmap(image_path, scale=1.0):
+    """
+    Return a pixmap of the svg in image_path rendered at scale times its
+    default size, rendering it only the first time.
+    """
+    key = (image_path, scale)
+    pixmap = _PIXMAP_CACHE.get(key)
+    if pixmap is None:
+        renderer = QSvgRenderer(image_path)
+        size = renderer.defaultSize()
+        pixmap = QPixmap(int(size.width() * scale),
+                         int(size.height() * scale))
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        renderer.render(painter)
+        painter.end()
+        _PIXMAP_CACHE[key] = pixmap
+    return QPixmap(pixmap)
+
+
+def create_plain_button(text):
+    """Create a push button that isn't triggered by the Enter key."""
+    button = QPushButton(text)
+    button.setAutoDefault(False)
+    return button
+
 
 class KiteIntegrationInfo(QWidget):
     """Initial Widget with info about the integration with Kite."""
@@ -46,17 +137,15 @@ class KiteIntegrationInfo(QWidget):
         else:
             icon_filename = 'spyder_kite_dark.svg'
         image_path = get_image_path(icon_filename)
-        image = QPixmap(image_path)
         image_label = QLabel()
         screen = QApplication.primaryScreen()
         device_image_ratio = screen.devicePixelRatio()
+        # Rasterize the svg directly at the size it's going to be shown
         if device_image_ratio > 1:
+            image = get_cached_svg_pixmap(image_path)
             image.setDevicePixelRatio(device_image_ratio)
         else:
-            image_height = image.height() * 0.5
-            image_width = image.width() * 0.5
-            image = image.scaled(image_width, image_height, Qt.KeepAspectRatio,
-                                 Qt.SmoothTransformation)
+            image = get_cached_svg_pixmap(image_path, scale=0.5)
         image_label.setPixmap(image)
 
         images_layout.addStretch()
@@ -64,25 +153,14 @@ class KiteIntegrationInfo(QWidget):
         images_layout.addStretch()
 
         # Label
-        integration_label = QLabel(
-            _("Now Spyder can use <a href=\"{kite_url}\">Kite</a> to "
-              "provide better and more accurate code completions in its "
-              "editor <br>for the most important packages in the Python "
-              "scientific ecosystem, such as Numpy, <br>Matplotlib and "
-              "Pandas.<br><br>Would you like to install it or learn more "
-              "about it?<br><br><i>Note:</i> Kite is free to use "
-              "but is not an open source program.")
-            .format(kite_url=KITE_SPYDER_URL))
+        integration_label = QLabel(INTEGRATION_HTML)
         integration_label.setOpenExternalLinks(True)
 
         # Buttons
         buttons_layout = QHBoxLayout()
-        learn_more_button = QPushButton(_('Learn more'))
-        learn_more_button.setAutoDefault(False)
-        install_button = QPushButton(_('Install Kite'))
-        install_button.setAutoDefault(False)
-        dismiss_button = QPushButton(_('Dismiss'))
-        dismiss_button.setAutoDefault(False)
+        learn_more_button = create_plain_button(_('Learn more'))
+        install_button = create_plain_button(_('Install Kite'))
+        dismiss_button = create_plain_button(_('Dismiss'))
         buttons_layout.addStretch()
         buttons_layout.addWidget(install_button)
         buttons_layout.addWidget(learn_more_button)
@@ -112,23 +190,7 @@ class KiteWelcome(QWidget):
         self.setFixedHeight(350)
 
         # Left side
-        install_info = QLabel(
-            _("<big><b>Level up your completions with "
-              "Kite</b></big><br><br>"
-              "Kite is a native app that runs locally "
-              "on your computer <br>and uses machine learning "
-              "to provide advanced <br>completions.<br><br>"
-              "&#10003; Specialized support for Python "
-              "data analysis packages<br><br>"
-              "&#10003; 1.5x more completions "
-              "than the builtin engine<br><br>"
-              "&#10003; Completions ranked by code context <br><br>"
-              "&#10003; Full line code completions<br><br>"
-              "&#10003; 100% local - no internet "
-              "connection required<br><br>"
-              "&#10003; 100% free to use<br><br>"
-              "<a href=\"{kite_url}\">Learn more on the Kite website</a>")
-            .format(kite_url=KITE_SPYDER_URL))
+        install_info = QLabel(WELCOME_HTML)
         install_info.setOpenExternalLinks(True)
 
         # Right side
@@ -137,12 +199,14 @@ class KiteWelcome(QWidget):
 
         install_gif = QMovie(install_gif_source)
         install_gif_label = QLabel()
-        install_gif.start()
+        # The movie is only played while this widget is visible
+        install_gif.jumpToFrame(0)
         install_image = install_gif.currentPixmap()
-        image_height = install_image.height() * 0.8
-        image_width = install_image.width() * 0.8
+        image_height = int(install_image.height() * 0.8)
+        image_width = int(install_image.width() * 0.8)
         install_gif.setScaledSize(QSize(image_width, image_height))
         install_gif_label.setMovie(install_gif)
+        self._install_gif = install_gif
 
         button_layout = QHBoxLayout()
         install_button = QPushButton(_('Install Kite'))
@@ -166,6 +230,16 @@ class KiteWelcome(QWidget):
         install_button.clicked.connect(self.sig_install_button_clicked)
         dismiss_button.clicked.connect(self.sig_dismiss_button_clicked)
 
+    def showEvent(self, event):
+        """Reimplemented Qt method."""
+        self._install_gif.start()
+        super(KiteWelcome, self).showEvent(event)
+
+    def hideEvent(self, event):
+        """Reimplemented Qt method."""
+        self._install_gif.setPaused(True)
+        super(KiteWelcome, self).hideEvent(event)
+
 
 class HoverEventFilter(QObject):
     """QObject to handle event filtering."""
@@ -174,14 +248,29 @@ class HoverEventFilter(QObject):
     # Signal to trigger on a HoverLeave event
     sig_hover_leave = Signal()
 
+    def __init__(self, parent=None):
+        super(HoverEventFilter, self).__init__(parent)
+        self._is_inside = False
+
     def eventFilter(self, widget, event):
         """Reimplemented Qt method."""
-        if event.type() == QEvent.HoverEnter:
-            self.sig_hover_enter.emit()
-        elif event.type() == QEvent.HoverLeave:
-            self.sig_hover_leave.emit()
+        event_type = event.type()
+        if event_type != HOVER_ENTER and event_type != HOVER_LEAVE:
+            return False
+
+        is_inside = event_type == HOVER_ENTER
+        if is_inside != self._is_inside:
+            self._is_inside = is_inside
+            if is_inside:
+                self.sig_hover_enter.emit()
+            else:
+                self.sig_hover_leave.emit()
 
-        return super(HoverEventFilter, self).eventFilter(widget, event)
+        return False
+
+    def reset(self):
+        """Reset hover state."""
+        self._is_inside = False
 
 
 class KiteInstallation(QWidget):
@@ -198,7 +287,10 @@ class KiteInstallation(QWidget):
         self._progress_filter = HoverEventFilter()
         self._progress_bar = QProgressBar(self)
         self._progress_bar.setFixedWidth(180)
-        self._progress_widget.installEventFilter(self._progress_filter)
+        self._current_status = None
+        self._pending_progress = None
+        self._progress_flush_scheduled = False
+        self._progress_timer = QElapsedTimer()
         self.cancel_button = QPushButton()
         self.cancel_button.setIcon(ima.icon('DialogCloseButton'))
         self.cancel_button.hide()
@@ -207,13 +299,7 @@ class KiteInstallation(QWidget):
         self._progress_widget.setLayout(progress_layout)
 
         self._progress_label = QLabel(_('Downloading'))
-        install_info = QLabel(
-            _("Kite comes with a native app called the Copilot <br>"
-              "which provides you with real time <br>"
-              "documentation as you code.<br><br>"
-              "When Kite is done installing, the Copilot will <br>"
-              "launch automatically and guide you throught the <br>"
-              "rest of the setup process."))
+        install_info = QLabel(INSTALL_INFO_HTML)
 
         button_layout = QHBoxLayout()
         self.ok_button = QPushButton(_('OK'))
@@ -232,20 +318,24 @@ class KiteInstallation(QWidget):
         # Right side
         copilot_image_source = get_image_path('kite_copilot.png')
 
-        copilot_image = QPixmap(copilot_image_source)
+        copilot_image = get_cached_pixmap(copilot_image_source)
         copilot_label = QLabel()
         screen = QApplication.primaryScreen()
         device_pixel_ratio = screen.devicePixelRatio()
         if device_pixel_ratio > 1:
             copilot_image.setDevicePixelRatio(device_pixel_ratio)
-            copilot_label.setPixmap(copilot_image)
         else:
-            image_height = copilot_image.height() * 0.4
-            image_width = copilot_image.width() * 0.4
-            copilot_label.setPixmap(
-                copilot_image.scaled(image_width, image_height,
-                                     Qt.KeepAspectRatio,
-                                     Qt.SmoothTransformation))
+            image_height = int(copilot_image.height() * 0.4)
+            image_width = int(copilot_image.width() * 0.4)
+            copilot_image = copilot_image.scaled(image_width, image_height,
+                                                 Qt.KeepAspectRatio,
+                                                 Qt.SmoothTransformation)
+        copilot_label.setPixmap(copilot_image)
+        # Keep the label at the pixmap size so layout changes don't resize it
+        image_ratio = copilot_image.devicePixelRatio()
+        copilot_label.setFixedSize(
+            int(copilot_image.width() / image_ratio),
+            int(copilot_image.height() / image_ratio))
 
         # Layout
         general_layout = QHBoxLayout()
@@ -255,21 +345,68 @@ class KiteInstallation(QWidget):
         self.setLayout(general_layout)
 
         # Signals
-        self._progress_filter.sig_hover_enter.connect(
-            lambda: self.cancel_button.show())
-        self._progress_filter.sig_hover_leave.connect(
-            lambda: self.cancel_button.hide())
+        self._progress_filter.sig_hover_enter.connect(self._show_cancel)
+        self._progress_filter.sig_hover_leave.connect(self._hide_cancel)
+
+    def _show_cancel(self):
+        """Show the cancel button."""
+        self.cancel_button.show()
+
+    def _hide_cancel(self):
+        """Hide the cancel button."""
+        self.cancel_button.hide()
+
+    def showEvent(self, event):
+        """Reimplemented Qt method."""
+        # Only filter hover events while this widget is visible
+        self._progress_widget.installEventFilter(self._progress_filter)
+        super(KiteInstallation, self).showEvent(event)
+
+    def hideEvent(self, event):
+        """Reimplemented Qt method."""
+        self._progress_widget.removeEventFilter(self._progress_filter)
+        self._progress_filter.reset()
+        self.cancel_button.hide()
+        super(KiteInstallation, self).hideEvent(event)
 
     def update_installation_status(self, status):
         """Update installation status (downloading, installing, finished)."""
+        if status == self._current_status:
+            return
+        self._current_status = status
         self._progress_label.setText(status)
         if status == INSTALLING:
-            self._progress_bar.setRange(0, 0)
+            # Drop pending download progress so it doesn't override the
+            # busy indicator
+            self._pending_progress = None
+            if (self._progress_bar.minimum() != 0
+                    or self._progress_bar.maximum() != 0):
+                self._progress_bar.setRange(0, 0)
 
     def update_installation_progress(self, current_value, total):
         """Update installation progress bar."""
-        self._progress_bar.setMaximum(total)
+        if self._current_status == INSTALLING:
+            # The download is over, so don't override the busy indicator
+            return
+        self._pending_progress = (current_value, total)
+        if (not self._progress_timer.isValid() or
+                self._progress_timer.elapsed() >= PROGRESS_UPDATE_INTERVAL):
+            self._flush_progress()
+        elif not self._progress_flush_scheduled:
+            self._progress_flush_scheduled = True
+            QTimer.singleShot(PROGRESS_UPDATE_INTERVAL, self._flush_progress)
+
+    def _flush_progress(self):
+        """Apply the latest pending progress to the progress bar."""
+        self._progress_flush_scheduled = False
+        if self._pending_progress is None:
+            return
+        current_value, total = self._pending_progress
+        self._pending_progress = None
+        if total != self._progress_bar.maximum():
+            self._progress_bar.setMaximum(total)
         self._progress_bar.setValue(current_value)
+        self._progress_timer.start()
 
 
 class KiteInstallerDialog(QDialog):
@@ -277,30 +414,23 @@ class KiteInstallerDialog(QDialog):
 
     def __init__(self, parent, installation_thread):
         super(KiteInstallerDialog, self).__init__(parent)
-        if sys.platform == 'darwin':
-            self.setWindowFlags(Qt.Dialog | Qt.MSWindowsFixedSizeDialogHint
-                                | Qt.Tool)
-        else:
-            self.setWindowFlags(Qt.Dialog | Qt.MSWindowsFixedSizeDialogHint)
+        self.setWindowFlags(INSTALLER_WINDOW_FLAGS)
         self._parent = parent
         self._installation_thread = installation_thread
         self._integration_widget = KiteIntegrationInfo(self)
-        self._welcome_widget = KiteWelcome(self)
-        self._installation_widget = KiteInstallation(self)
+        # These widgets are created on demand
+        self._welcome_widget = None
+        self._installation_widget = None
+        self._installation_signals_connected = False
+        self._adjust_size_pending = False
 
         # Layout
-        installer_layout = QVBoxLayout()
-        installer_layout.addWidget(self._integration_widget)
-        installer_layout.addWidget(self._welcome_widget)
-        installer_layout.addWidget(self._installation_widget)
+        self._installer_layout = QVBoxLayout()
+        self._installer_layout.addWidget(self._integration_widget)
 
-        self.setLayout(installer_layout)
+        self.setLayout(self._installer_layout)
 
         # Signals
-        self._installation_thread.sig_download_progress.connect(
-            self._installation_widget.update_installation_progress)
-        self._installation_thread.sig_installation_status.connect(
-            self._installation_widget.update_installation_status)
         self._installation_thread.sig_installation_status.connect(
             self.finished_installation)
         self._installation_thread.sig_error_msg.connect(self._handle_error_msg)
@@ -310,14 +440,6 @@ class KiteInstallerDialog(QDialog):
             self.install)
         self._integration_widget.sig_dismiss_button_clicked.connect(
             self.reject)
-        self._welcome_widget.sig_install_button_clicked.connect(
-            self.install)
-        self._welcome_widget.sig_dismiss_button_clicked.connect(
-            self.reject)
-        self._installation_widget.ok_button.clicked.connect(
-            self.close_installer)
-        self._installation_widget.cancel_button.clicked.connect(
-            self.cancel_install)
 
         # Show integration widget
         self.setup()
@@ -334,40 +456,111 @@ class KiteInstallerDialog(QDialog):
             .format(kite_url=KITE_SPYDER_URL, kite_contact=KITE_CONTACT_URL))
         self.accept()
 
+    def _ensure_welcome(self):
+        """Create the welcome widget if it doesn't exist yet."""
+        if self._welcome_widget is None:
+            self._welcome_widget = KiteWelcome(self)
+            self._welcome_widget.hide()
+            self._installer_layout.addWidget(self._welcome_widget)
+            self._welcome_widget.sig_install_button_clicked.connect(
+                self.install)
+            self._welcome_widget.sig_dismiss_button_clicked.connect(
+                self.reject)
+
+    def _ensure_installation(self):
+        """Create the installation widget if it doesn't exist yet."""
+        if self._installation_widget is None:
+            self._installation_widget = KiteInstallation(self)
+            self._installation_widget.hide()
+            self._installer_layout.addWidget(self._installation_widget)
+            self._installation_widget.ok_button.clicked.connect(
+                self.close_installer)
+            self._installation_widget.cancel_button.clicked.connect(
+                self.cancel_install)
+
+    def _connect_installation_signals(self):
+        """Forward installation thread updates to the installation widget."""
+        if self._installation_signals_connected:
+            return
+        self._installation_thread.sig_download_progress.connect(
+            self._installation_widget.update_installation_progress)
+        self._installation_thread.sig_installation_status.connect(
+            self._installation_widget.update_installation_status)
+        self._installation_signals_connected = True
+
+    def _disconnect_installation_signals(self):
+        """Stop forwarding installation thread updates to the widget."""
+        if not self._installation_signals_connected:
+            return
+        self._installation_signals_connected = False
+        for signal, slot in [
+                (self._installation_thread.sig_download_progress,
+                 self._installation_widget.update_installation_progress),
+                (self._installation_thread.sig_installation_status,
+                 self._installation_widget.update_installation_status)]:
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                # Already disconnected
+                pass
+
     def setup(self, integration=True, welcome=False, installation=False):
         """Setup visibility of widgets."""
         self._integration_widget.setVisible(integration)
-        self._welcome_widget.setVisible(welcome)
-        self._installation_widget.setVisible(installation)
+        if self._welcome_widget is not None:
+            self._welcome_widget.setVisible(welcome)
+        if self._installation_widget is not None:
+            self._installation_widget.setVisible(installation)
+        if not self.isVisible():
+            # Resize right away so the dialog is shown at the right size
+            self.adjustSize()
+        elif not self._adjust_size_pending:
+            # Resize once Qt has processed the visibility changes
+            self._adjust_size_pending = True
+            QTimer.singleShot(0, self._adjust_size)
+
+    def _adjust_size(self):
+        """Adjust the dialog size to the currently visible widget."""
+        self._adjust_size_pending = False
         self.adjustSize()
 
     def welcome(self):
         """Show welcome widget."""
+        self._ensure_welcome()
         self.setup(integration=False, welcome=True, installation=False)
 
     def install(self):
         """Initialize installation process and show install widget."""
+        self._ensure_installation()
+        self._connect_installation_signals()
         self.setup(integration=False, welcome=False, installation=True)
         self._installation_thread.cancelled = False
         self._installation_thread.install()
 
     def cancel_install(self):
-        """Cancel the installation in progress."""
-        reply = QMessageBox.critical(
-            self._parent, 'Spyder',
+        """Ask to cancel the installation in progress."""
+        # Don't block the event loop so installation updates keep flowing
+        message_box = QMessageBox(
+            QMessageBox.Critical, 'Spyder',
             _('Do you really want to cancel Kite installation?'),
-            QMessageBox.Yes, QMessageBox.No)
+            QMessageBox.Yes | QMessageBox.No, self)
+        message_box.setAttribute(Qt.WA_DeleteOnClose)
+        message_box.finished.connect(self._on_cancel_reply)
+        message_box.open()
+
+    def _on_cancel_reply(self, reply):
+        """Cancel the installation if the user confirmed it."""
         if reply == QMessageBox.Yes and self._installation_thread.isRunning():
             self._installation_thread.cancelled = True
             self._installation_thread.quit()
+            self._disconnect_installation_signals()
             self.setup()
             self.accept()
-            return True
-        return False
 
     def finished_installation(self, status):
         """Handle finished installation."""
         if status == FINISHED:
+            self._disconnect_installation_signals()
             self.setup()
             self.accept()
 
@@ -376,6 +569,7 @@ class KiteInstallerDialog(QDialog):
         if (self._installation_thread.status == ERRORED
                 or self._installation_thread.status == FINISHED
                 or self._installation_thread.status == CANCELLED):
+            self._disconnect_installation_signals()
             self.setup()
             self.accept()
         else:
@@ -383,7 +577,9 @@ class KiteInstallerDialog(QDialog):
 
     def reject(self):
         """Reimplement Qt method."""
-        on_installation_widget = self._installation_widget.isVisible()
+        on_installation_widget = (
+            self._installation_widget is not None
+            and self._installation_widget.isVisible())
         if on_installation_widget:
             self.close_installer()
         else:
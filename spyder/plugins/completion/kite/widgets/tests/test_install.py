@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+# Copyright © Spyder Project Contributors
+# Licensed under the terms of the MIT License
+# (see spyder/__init__.py for details)
+
+"""Kite installation widgets test."""
+
+# Third-party imports
+import pytest
+from qtpy.QtCore import QEvent, QObject, QPoint, QPointF, Signal
+from qtpy.QtGui import QHoverEvent
+from qtpy.QtWidgets import QApplication, QMessageBox
+
+# Local imports
+from spyder.plugins.completion.kite.utils.install import (
+    DOWNLOADING_INSTALLER, INSTALLING, NO_STATUS)
+from spyder.plugins.completion.kite.widgets.install import (
+    KiteInstallation, KiteInstallerDialog)
+
+
+class StubInstallationThread(QObject):
+    """Installation thread replacement that doesn't install anything."""
+    sig_installation_status = Signal(str)
+    sig_download_progress = Signal(int, int)
+    sig_error_msg = Signal(str)
+
+    def __init__(self):
+        super(StubInstallationThread, self).__init__()
+        self.status = NO_STATUS
+        self.cancelled = False
+        self.running = True
+
+    def install(self):
+        pass
+
+    def isRunning(self):
+        return self.running
+
+    def quit(self):
+        self.running = False
+
+
+def send_hover_event(widget, event_type):
+    """Send a synthetic hover event to widget."""
+    event = QHoverEvent(event_type, QPointF(QPoint(1, 1)),
+                        QPointF(QPoint(1, 1)))
+    QApplication.sendEvent(widget, event)
+
+
+@pytest.fixture
+def installer(qtbot):
+    """Set up the Kite installer dialog with a stub installation thread."""
+    dialog = KiteInstallerDialog(None, StubInstallationThread())
+    qtbot.addWidget(dialog)
+    return dialog
+
+
+@pytest.fixture
+def installation_widget(qtbot):
+    """Set up the Kite installation widget."""
+    widget = KiteInstallation(None)
+    qtbot.addWidget(widget)
+    return widget
+
+
+def test_hover_filter_emits_on_transitions(qtbot, installation_widget):
+    """Test that repeated hover events only emit on enter/leave changes."""
+    progress_filter = installation_widget._progress_filter
+    progress_widget = installation_widget._progress_widget
+    entered = []
+    left = []
+    progress_filter.sig_hover_enter.connect(lambda: entered.append(True))
+    progress_filter.sig_hover_leave.connect(lambda: left.append(True))
+    installation_widget.show()
+
+    send_hover_event(progress_widget, QEvent.HoverEnter)
+    send_hover_event(progress_widget, QEvent.HoverEnter)
+    send_hover_event(progress_widget, QEvent.HoverLeave)
+    assert len(entered) == 1
+    assert len(left) == 1
+
+    # The filter is detached while the widget is hidden
+    installation_widget.hide()
+    send_hover_event(progress_widget, QEvent.HoverEnter)
+    assert len(entered) == 1
+    assert not installation_widget.cancel_button.isVisible()
+
+
+def test_installer_dismiss_creates_no_widgets(qtbot, installer):
+    """Test that dismissing the integration page builds no other pages."""
+    installer.show()
+    installer._integration_widget.sig_dismiss_button_clicked.emit()
+    assert not installer.isVisible()
+    assert installer._welcome_widget is None
+    assert installer._installation_widget is None
+
+
+def test_installer_creates_widgets_once(qtbot, installer):
+    """Test that pages are only created and wired the first time."""
+    thread = installer._installation_thread
+    installer.welcome()
+    welcome_widget = installer._welcome_widget
+    installer.welcome()
+    assert installer._welcome_widget is welcome_widget
+    assert welcome_widget.receivers(
+        welcome_widget.sig_install_button_clicked) == 1
+
+    installer.install()
+    installation_widget = installer._installation_widget
+    installer.install()
+    assert installer._installation_widget is installation_widget
+    assert installer._installer_layout.count() == 3
+    assert thread.receivers(thread.sig_download_progress) == 1
+    # The dialog's finished_installation is also connected to it
+    assert thread.receivers(thread.sig_installation_status) == 2
+
+
+def test_progress_burst_shows_last_value(qtbot, installation_widget):
+    """Test that throttled progress updates end with the latest value."""
+    progress_bar = installation_widget._progress_bar
+    for value in range(1, 101):
+        installation_widget.update_installation_progress(value, 100)
+    qtbot.waitUntil(lambda: progress_bar.value() == 100)
+    assert installation_widget._pending_progress is None
+
+
+def test_progress_maximum_only_set_on_change(qtbot, mocker,
+                                             installation_widget):
+    """Test that the progress bar maximum is only set when it changes."""
+    progress_bar = installation_widget._progress_bar
+    mocker.spy(progress_bar, 'setMaximum')
+    installation_widget.update_installation_progress(10, 50)
+    installation_widget._flush_progress()
+    installation_widget.update_installation_progress(20, 50)
+    installation_widget._flush_progress()
+    assert progress_bar.setMaximum.call_count == 1
+    installation_widget.update_installation_progress(20, 200)
+    installation_widget._flush_progress()
+    assert progress_bar.setMaximum.call_count == 2
+    assert progress_bar.maximum() == 200
+
+
+def test_progress_after_installing_keeps_busy(qtbot, installation_widget):
+    """Test that late download progress doesn't replace the busy range."""
+    progress_bar = installation_widget._progress_bar
+    installation_widget.update_installation_progress(10, 100)
+    installation_widget.update_installation_progress(20, 100)
+    installation_widget.update_installation_status(INSTALLING)
+    installation_widget.update_installation_progress(30, 100)
+    qtbot.wait(2 * 16)
+    assert (progress_bar.minimum(), progress_bar.maximum()) == (0, 0)
+
+
+def test_repeated_status_is_skipped(qtbot, mocker, installation_widget):
+    """Test that the same installation status is only applied once."""
+    progress_label = installation_widget._progress_label
+    mocker.spy(progress_label, 'setText')
+    installation_widget.update_installation_status(DOWNLOADING_INSTALLER)
+    installation_widget.update_installation_status(DOWNLOADING_INSTALLER)
+    assert progress_label.setText.call_count == 1
+    installation_widget.update_installation_status(INSTALLING)
+    assert progress_label.setText.call_count == 2
+
+
+@pytest.mark.parametrize('reply', [QMessageBox.Yes, QMessageBox.No])
+def test_cancel_reply(qtbot, installer, reply):
+    """Test that only a Yes reply cancels the installation."""
+    thread = installer._installation_thread
+    installer.install()
+    installer._on_cancel_reply(reply)
+    cancelled = reply == QMessageBox.Yes
+    assert thread.cancelled == cancelled
+    assert thread.isRunning() != cancelled
+    assert installer._installation_signals_connected != cancelled
+    assert thread.receivers(thread.sig_download_progress) == int(
+        not cancelled)